@@ -9,12 +9,70 @@ Description:
     The output will show results in visualizations and allows the user to download a compliance report (in PDF).
 """
 
+import os
+import copy
+import functools
 import yaml
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import plotly.express as px
-from io import StringIO
+from pandas.api.types import union_categoricals
+from io import BytesIO, TextIOBase
+
+# Prefer the libyaml-backed C loader when available (falls back to pure Python)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Use pyarrow's streaming CSV reader when installed (falls back to chunked pandas C engine)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Columns required in the uploaded CSV patch log
+_EXPECTED_COLUMNS = frozenset({"server", "patch", "timestamp"})
+
+# Columns are read as text on both engines: timestamps so the explicit date format is always
+# enforced, server/patch IDs so chunks agree on one dtype (evaluate_compliance compares IDs as text)
+_CSV_DTYPES = {"server": str, "patch": str, "timestamp": str}
+
+# Number of CSV rows parsed per chunk when reading patch logs with the C engine
+_CSV_CHUNK_SIZE = 100_000
+
+# Bytes of CSV parsed per record batch when reading patch logs with pyarrow
+_ARROW_BLOCK_SIZE = 16 << 20
+
+# Scoring lookup tables
+_SCORE_EPOCH = np.datetime64("2024-01-01", "D")
+_RECENCY_THRESHOLDS = np.array([90, 150])           # Days since epoch (exclusive)
+_RECENCY_BONUS = np.array([5, 15, 25])              # Indexed by number of thresholds exceeded
+_ACTIVITY_BONUS = np.array([5, 5, 10, 15])          # Indexed by patch count (capped at 3)
+_PARTIAL_SCORE = np.array([0, 10, 20, 30])          # Indexed by patch count (capped at 3)
+
+# Compliance status thresholds (minimum score, highest first) and labels
+_STATUS_THRESHOLDS = (80, 40)
+_STATUS_LABELS = ("Compliant", "Partially Compliant")
+_DEFAULT_STATUS = "Non-Compliant"
+
+# Number of servers shown per page in the drill-down dashboard
+_DRILLDOWN_PAGE_SIZE = 50
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_cached(content):
+    """
+    Parse YAML content, memoized on the raw content.
+
+    Args:
+        content (bytes | str): Raw YAML content.
+
+    Returns:
+        dict: Parsed YAML document (shared between calls, never returned to callers directly).
+    """
+    return yaml.load(content, Loader=_YamlLoader)
 
 
 def load_patch_manifest(file_obj):
@@ -22,13 +80,128 @@ def load_patch_manifest(file_obj):
     Load the patch manifest from a YAML (.yaml/.yml) file.
 
     Args:
-        file_obj: File-like object containing YAML content.
+        file_obj: File path or file-like object containing YAML content.
 
     Returns:
         dict: Dictionary mapping server names to required patch IDs.
     """
-    # Parse YAML content from file-like object
-    return yaml.safe_load(file_obj)
+    # Read raw YAML content from a path or file-like object
+    if isinstance(file_obj, (str, os.PathLike)):
+        with open(file_obj, "rb") as f:
+            content = f.read()
+    elif hasattr(file_obj, "getvalue"):
+        content = file_obj.getvalue()
+    else:
+        content = file_obj.read()
+
+    # Parse YAML content (cached on content); copy so callers never mutate the cached manifest
+    return copy.copy(_parse_yaml_cached(content))
+
+
+def _validate_and_normalize(chunk):
+    """
+    Validate the columns of parsed CSV rows and normalize them for scoring.
+
+    Args:
+        chunk (pd.DataFrame): Rows read from the CSV log.
+
+    Returns:
+        pd.DataFrame: Rows with categorical server/patch and datetime timestamp columns.
+    """
+    # Error Handling for CSV
+    missing = _EXPECTED_COLUMNS.difference(chunk.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {sorted(missing)}\nFound: {chunk.columns.tolist()}")
+
+    # Keep only the needed columns and convert timestamps to datetime objects
+    chunk = chunk[["server", "patch", "timestamp"]].assign(
+        timestamp=pd.to_datetime(chunk["timestamp"], format="%Y-%m-%d", cache=True)
+    )
+
+    # Blank timestamps parse to NaT; reject them like any other malformed date
+    if chunk["timestamp"].isna().any():
+        raise ValueError("Missing timestamp in one or more log entries (expected YYYY-MM-DD)")
+
+    # Store repeated server/patch IDs as categoricals (int codes + shared dictionary)
+    return chunk.astype({"server": "category", "patch": "category"})
+
+
+def _summarize_logs(logs, count):
+    """
+    Reduce log rows to one row per server/patch pair.
+
+    Args:
+        logs (pd.DataFrame): Log rows (or partial summaries) with server, patch and timestamp columns.
+        count (tuple): Named-aggregation spec producing the entry count per pair.
+
+    Returns:
+        pd.DataFrame: Server, patch, count and latest timestamp per pair.
+    """
+    return logs.groupby(["server", "patch"], observed=True, dropna=False, as_index=False).agg(
+        count=count,
+        timestamp=("timestamp", "max"),
+    )
+
+
+def _concat_categorical(frames):
+    """
+    Concatenate partial summaries, unifying server/patch categories across them.
+
+    Args:
+        frames (list): DataFrames with categorical server and patch columns.
+
+    Returns:
+        pd.DataFrame: Concatenated DataFrame with server/patch still categorical.
+    """
+    for column in ("server", "patch"):
+        categories = union_categoricals([frame[column] for frame in frames]).categories
+        frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _iter_arrow_chunks(file_obj):
+    """
+    Stream the CSV log as DataFrame chunks using pyarrow's incremental CSV reader.
+
+    Args:
+        file_obj: File path or file-like object containing CSV content.
+
+    Yields:
+        pd.DataFrame: Rows of one record batch (a single empty frame for a header-only file).
+    """
+    if isinstance(file_obj, os.PathLike):
+        file_obj = os.fspath(file_obj)
+    elif isinstance(file_obj, TextIOBase):
+        # pyarrow only reads binary streams; re-encode text buffers in memory
+        file_obj = BytesIO(file_obj.read().encode("utf-8"))
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types={column: pa.string() for column in _CSV_DTYPES},
+        strings_can_be_null=True,
+    )
+    read_options = pa_csv.ReadOptions(block_size=_ARROW_BLOCK_SIZE)
+
+    with pa_csv.open_csv(file_obj, read_options=read_options, convert_options=convert_options) as reader:
+        empty = True
+        for batch in reader:
+            empty = False
+            yield batch.to_pandas()
+        if empty:
+            yield reader.schema.empty_table().to_pandas()
+
+
+def _iter_pandas_chunks(file_obj):
+    """
+    Stream the CSV log as DataFrame chunks using the pandas C engine.
+
+    Args:
+        file_obj: File path or file-like object containing CSV content.
+
+    Yields:
+        pd.DataFrame: Up to _CSV_CHUNK_SIZE rows per chunk.
+    """
+    with pd.read_csv(file_obj, chunksize=_CSV_CHUNK_SIZE, dtype=_CSV_DTYPES) as reader:
+        yield from reader
 
 
 def parse_log_file(file_obj):
@@ -39,115 +212,96 @@ def parse_log_file(file_obj):
         file_obj: File-like object containing CSV content.
 
     Returns:
-        list: List of dictionaries representing a server patch log.
+        pd.DataFrame: One row per server/patch pair with the number of log
+            entries (count) and the latest patch timestamp (timestamp).
     """
-    logs = []
-
-    # Read CSV file into a pandas DataFrame
-    df = pd.read_csv(file_obj)
-
-    # Error Handling for CSV
-    expected_columns = {"server", "patch", "timestamp"}
-    if not expected_columns.issubset(df.columns):
-        raise ValueError(f"Missing required columns.\nFound: {df.columns.tolist()}")
+    chunks = _iter_arrow_chunks(file_obj) if _HAS_PYARROW else _iter_pandas_chunks(file_obj)
 
-    # Iterate over rows in DF to extract & format patch log information
-    for _, row in df.iterrows():
-        logs.append(
-            {
-                "server": row["server"],    # Server Name
-                "patch": row["patch"],      # Applied Patch ID
-                "timestamp": datetime.strptime(row["timestamp"], "%Y-%m-%d"),   # Converts timestamp string to datetime object
-            }
-        )
+    # Reduce each chunk to a server/patch summary so only one chunk of raw rows is in memory
+    partials = [_summarize_logs(_validate_and_normalize(chunk), count=("timestamp", "size")) for chunk in chunks]
 
-    return logs
+    # Re-reduce the partial summaries (pairs may span several chunks)
+    return _summarize_logs(_concat_categorical(partials), count=("count", "sum"))
 
 
-def evaluate_compliance(patch_manifest, logs):
+def evaluate_compliance(patch_manifest, logs_df):
     """
     Evaluate compliance by comparing patch logs against the patch manifest.
 
     Args:
         patch_manifest (dict): Dictionary of server: required_patch pairs.
-        logs (list): List of log entries from the CSV.
+        logs_df (pd.DataFrame): Server patch log as returned by parse_log_file, or raw
+            log rows (server, patch, timestamp) where each row counts as one entry.
 
     Returns:
-        dict: Dictionary mapping each server to 'Compliant' or 'Non-Compliant'.
-    """
-    compliance = {}     # Compliance status for each server
-    scores = []         # Scores for each server
-    breakdown = []      # Breakdown of compliance per server
-
-    for server, required_patch in patch_manifest.items():
-        # Find all logs for the current server
-        matching_logs = [log for log in logs if log["server"] == server]
-
-        # Determine if required patch was applied
-        has_required_patch = any(log["patch"] == required_patch for log in matching_logs)
-
-        # Calculate compliance score (0-100)
-        score = 0
-        
-        if has_required_patch:
-            # Base score for having required patch
-            score = 60
-            
-            # Bonus points for patch recency (up to 25 points)
-            if matching_logs:
-                latest_date = max(log["timestamp"] for log in matching_logs)
-                days_since_2024 = (latest_date - datetime(2024, 1, 1)).days
-                if days_since_2024 > 150:  # Recent patches (after ~May 2024)
-                    score += 25
-                elif days_since_2024 > 90:  # Moderately recent
-                    score += 15
-                else:  # Older patches
-                    score += 5
-            
-            # Bonus points for patch management activity (up to 15 points)
-            patch_count = len(matching_logs)
-            if patch_count >= 3:
-                score += 15
-            elif patch_count >= 2:
-                score += 10
-            else:
-                score += 5
-                
-        else:
-            # Partial credit for having some patches, even if not the required one
-            if matching_logs:
-                patch_count = len(matching_logs)
-                if patch_count >= 3:
-                    score = 30  # Shows active patch management
-                elif patch_count >= 2:
-                    score = 20
-                else:
-                    score = 10
-            # If no patches at all, score remains 0
-
-        # Ensure score doesn't exceed 100
-        score = min(score, 100)
-
-        # Determine compliance status based on score
-        if score >= 80:
-            compliance[server] = "Compliant"
-        elif score >= 40:
-            compliance[server] = "Partially Compliant"
-        else:
-            compliance[server] = "Non-Compliant"
-
-        scores.append({"server": server, "score": score})
-
-        # Find most recent patch date (If no logs exist, mark as "N/A")
-        latest_patch_date = max((log["timestamp"] for log in matching_logs), default="N/A")
-        breakdown.append({
-            "server": server,
-            "required_patch": required_patch,
-            "status": compliance[server],
-            "latest_patch_date": latest_patch_date if latest_patch_date != "N/A" else "N/A"
-        })
-
-    return compliance, pd.DataFrame(scores), pd.DataFrame(breakdown)
+        tuple: Dictionary mapping each server to its compliance status,
+            DataFrame of scores per server, and DataFrame of per-server breakdown.
+    """
+    # Manifest as a Series indexed by server (preserves manifest server order). IDs are compared
+    # as text, matching the CSV log, since YAML parses numeric IDs (e.g. 5012170) as ints
+    servers = list(patch_manifest)
+    manifest_series = pd.Series(
+        [str(patch) for patch in patch_manifest.values()],
+        index=pd.Index([str(server) for server in servers], name="server"),
+        name="required_patch",
+        dtype=object,
+    )
+
+    # Flag log entries that applied the server's required patch (single vectorized lookup)
+    match = logs_df["patch"].to_numpy(dtype=object) == logs_df["server"].map(manifest_series).to_numpy(dtype=object)
+
+    # Log entries per row (pre-aggregated by parse_log_file, otherwise one per row)
+    entries = logs_df["count"] if "count" in logs_df.columns else 1
+
+    # Per-server aggregates: latest patch date, number of patches, required patch matches
+    agg = logs_df.assign(match=match, count=entries).groupby("server", observed=True).agg(
+        latest=("timestamp", "max"),
+        count=("count", "sum"),
+        matches=("match", "sum"),
+    )
+    # Left join onto the manifest; servers missing from the logs get NaN aggregates
+    merged = manifest_series.reset_index().join(agg, on="server")
+
+    patch_count = np.clip(merged["count"].fillna(0).to_numpy(dtype="int64"), 0, 3)
+    has_required_patch = merged["matches"].fillna(0).to_numpy() > 0
+
+    # Latest patch date per server, reduced once and reused for scoring and the breakdown
+    latest_patch_date = merged["latest"]
+    latest_day = latest_patch_date.to_numpy(dtype="datetime64[D]")
+    has_logs = ~np.isnat(latest_day)
+
+    # Whole days since 2024-01-01 (servers without logs never use the recency bonus)
+    days_since_2024 = np.where(has_logs, (latest_day - _SCORE_EPOCH).astype("int64"), 0).astype("int32")
+
+    # Bonus points for patch recency (up to 25 points)
+    recency_bonus = _RECENCY_BONUS[np.searchsorted(_RECENCY_THRESHOLDS, days_since_2024)]
+
+    # Bonus points for patch management activity (up to 15 points)
+    activity_bonus = _ACTIVITY_BONUS[patch_count]
+
+    # Partial credit for having some patches, even if not the required one (0 if no patches at all)
+    partial_score = _PARTIAL_SCORE[patch_count]
+
+    # Calculate compliance score (0-100); base score of 60 for having the required patch
+    score = np.where(has_required_patch, 60 + recency_bonus + activity_bonus, partial_score)
+    score = np.minimum(score, 100)
+
+    # Determine compliance status based on score
+    status = np.select([score >= t for t in _STATUS_THRESHOLDS], _STATUS_LABELS, default=_DEFAULT_STATUS)
+    compliance = dict(zip(servers, status.tolist()))
+
+    scores_df = pd.DataFrame({"server": servers, "score": score})
+
+    # Most recent patch date (If no logs exist, mark as "N/A")
+    latest_patch_date = latest_patch_date.astype(object).where(has_logs, "N/A")
+    breakdown_df = pd.DataFrame({
+        "server": servers,
+        "required_patch": list(patch_manifest.values()),
+        "status": status,
+        "latest_patch_date": latest_patch_date,
+    })
+
+    return compliance, scores_df, breakdown_df
 
 
 def generate_summary_text(compliance):
@@ -172,6 +326,28 @@ def generate_summary_text(compliance):
     return summary
 
 
+@st.cache_data
+def _analyze(yaml_bytes, csv_bytes):
+    """
+    Run the compliance analysis on the raw contents of the uploaded files.
+
+    Results are cached by Streamlit on the file contents, so reruns triggered by
+    other widgets (e.g. company/reviewer inputs) skip re-parsing and re-scoring.
+
+    Args:
+        yaml_bytes (bytes): Raw contents of the YAML patch manifest.
+        csv_bytes (bytes): Raw contents of the CSV patch log.
+
+    Returns:
+        tuple: (compliance dict, score DataFrame, breakdown DataFrame, summary string).
+    """
+    patch_manifest = load_patch_manifest(BytesIO(yaml_bytes))
+    logs = parse_log_file(BytesIO(csv_bytes))
+    compliance, score_df, breakdown_df = evaluate_compliance(patch_manifest, logs)
+    summary = generate_summary_text(compliance)
+    return compliance, score_df, breakdown_df, summary
+
+
 def main():
     """
     Main function that boots the Streamlit UI for SecuPatch.
@@ -196,10 +372,7 @@ def main():
 
     if yaml_file and csv_file:
         try:
-            patch_manifest = yaml.safe_load(yaml_file)
-            logs = parse_log_file(csv_file)
-            compliance, score_df, breakdown_df = evaluate_compliance(patch_manifest, logs)
-            summary = generate_summary_text(compliance)
+            compliance, score_df, breakdown_df, summary = _analyze(yaml_file.getvalue(), csv_file.getvalue())
             st.text(summary)
 
             # Show Compliance Scores
@@ -207,19 +380,28 @@ def main():
             st.bar_chart(score_df.set_index("server"))
 
             # Create Pie Chart
-            pie_df = score_df.copy()
-            pie_df["status"] = pie_df["score"].apply(lambda x: "Compliant" if x == 100 else "Non-Compliant")
-            pie_summary = pie_df["status"].value_counts().reset_index()
-            pie_summary.columns = ["status", "count"]
+            pie_status = pd.Series(np.where(score_df["score"].to_numpy() == 100, "Compliant", "Non-Compliant"), name="status")
+            pie_summary = pie_status.value_counts().reset_index(name="count")
             pie_chart = px.pie(pie_summary, names="status", values="count", title="Compliance Status")
             st.plotly_chart(pie_chart)
 
             # Create Drill-down dashboard
             st.subheader("Drill-down Server Patch Details")
-            for _, row in breakdown_df.iterrows():
-                with st.expander(f"{row['server']} - {row['status']}"):
-                    st.write(f"Required Patch: {row['required_patch']}")
-                    st.write(f"Latest Patch Date: {row['latest_patch_date']}")
+            status_filter = st.selectbox("Filter by Status", ["All", *_STATUS_LABELS, _DEFAULT_STATUS])
+            if status_filter != "All":
+                drilldown_df = breakdown_df[breakdown_df["status"] == status_filter]
+            else:
+                drilldown_df = breakdown_df
+
+            # Paginate expanders so only one page of widgets is rendered per rerun
+            page_count = max((len(drilldown_df) + _DRILLDOWN_PAGE_SIZE - 1) // _DRILLDOWN_PAGE_SIZE, 1)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+            st.caption(f"Page {page} of {page_count} ({len(drilldown_df)} servers)")
+            start = (page - 1) * _DRILLDOWN_PAGE_SIZE
+            for row in drilldown_df.iloc[start:start + _DRILLDOWN_PAGE_SIZE].itertuples(index=False):
+                with st.expander(f"{row.server} - {row.status}"):
+                    st.write(f"Required Patch: {row.required_patch}")
+                    st.write(f"Latest Patch Date: {row.latest_patch_date}")
 
             # Create Export & Download Button
             st.subheader("Download Compliance Report")
@@ -227,9 +409,8 @@ def main():
             report_df["company"] = company
             report_df["reviewer"] = reviewer
             report_df["report_generated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            csv_buffer = StringIO()
-            report_df.to_csv(csv_buffer, index=False)
-            st.download_button("Download CSV Report", csv_buffer.getvalue(), "secupatch_compliance_report.csv", "text/csv")
+            csv_bytes = report_df.to_csv(index=False).encode("utf-8")
+            st.download_button("Download CSV Report", data=csv_bytes, file_name="secupatch_compliance_report.csv", mime="text/csv")
 
         except Exception as e:
             st.error(f"Error during analysis: {e}")
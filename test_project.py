@@ -1,5 +1,7 @@
 # test_project.py
 import pytest
+import pandas as pd
+import project
 from project import parse_log_file, evaluate_compliance, load_patch_manifest
 from datetime import datetime
 
@@ -8,24 +10,66 @@ def test_parse_log_file(tmp_path):
     log_file.write_text("server,patch,timestamp\nsrv01,patch1,2024-05-01\nsrv02,patch2,2024-05-02\n")
     logs = parse_log_file(str(log_file))
     assert len(logs) == 2
-    assert logs[0]["server"] == "srv01"
-    assert logs[0]["patch"] == "patch1"
-    assert isinstance(logs[0]["timestamp"], datetime)
+    assert logs.iloc[0]["server"] == "srv01"
+    assert logs.iloc[0]["patch"] == "patch1"
+    assert isinstance(logs.iloc[0]["timestamp"], datetime)
+
+def test_parse_log_file_missing_columns(tmp_path):
+    log_file = tmp_path / "logs.csv"
+    log_file.write_text("server,patch\nsrv01,patch1\n")
+    with pytest.raises(ValueError, match="timestamp"):
+        parse_log_file(str(log_file))
+
+@pytest.mark.parametrize("has_pyarrow", [True, False])
+def test_parse_log_file_engines(tmp_path, monkeypatch, has_pyarrow):
+    if has_pyarrow:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(project, "_HAS_PYARROW", has_pyarrow)
+    monkeypatch.setattr(project, "_CSV_CHUNK_SIZE", 1)
+    monkeypatch.setattr(project, "_ARROW_BLOCK_SIZE", 32)
+    log_file = tmp_path / "logs.csv"
+    log_file.write_text("server,patch,timestamp\nsrv01,patch1,2024-05-01\nsrv02,patch2,2024-05-02\nsrv01,patch1,2024-06-01\n")
+    logs = parse_log_file(str(log_file))
+    assert len(logs) == 2
+    assert list(logs["server"]) == ["srv01", "srv02"]
+    assert list(logs["count"]) == [2, 1]
+    assert logs.iloc[0]["timestamp"] == datetime(2024, 6, 1)
+
+    bad_file = tmp_path / "bad.csv"
+    bad_file.write_text("server,patch,timestamp\nsrv01,patch1,2024-05-01 10:30:00\n")
+    with pytest.raises(ValueError):
+        parse_log_file(str(bad_file))
+
+    blank_file = tmp_path / "blank.csv"
+    blank_file.write_text("server,patch,timestamp\nsrv01,patch1,2024-05-01\nsrv01,patch1,\n")
+    with pytest.raises(ValueError, match="timestamp"):
+        parse_log_file(str(blank_file))
 
 def test_evaluate_compliance():
     patch_manifest = {
         "srv01": "patch1",
         "srv02": "patch2",
-        "srv03": "patch3"
+        "srv03": "patch3",
+        "srv04": "patch4"
     }
-    logs = [
+    logs = pd.DataFrame([
         {"server": "srv01", "patch": "patch1", "timestamp": datetime(2024, 5, 1)},
-        {"server": "srv02", "patch": "patch2", "timestamp": datetime(2024, 5, 2)}
-    ]
+        {"server": "srv02", "patch": "patch2", "timestamp": datetime(2024, 5, 2)},
+        {"server": "srv04", "patch": "patch4", "timestamp": datetime(2024, 2, 1)}
+    ])
     compliance, _, _ = evaluate_compliance(patch_manifest, logs)
     assert compliance["srv01"] == "Compliant"
     assert compliance["srv02"] == "Compliant"
     assert compliance["srv03"] == "Non-Compliant"
+    assert compliance["srv04"] == "Partially Compliant"
+
+def test_evaluate_compliance_numeric_ids(tmp_path):
+    yaml_file = tmp_path / "patch.yml"
+    yaml_file.write_text("srv01: 5012170\n1: p1")
+    log_file = tmp_path / "logs.csv"
+    log_file.write_text("server,patch,timestamp\nsrv01,5012170,2024-06-01\n1,p1,2024-06-01\n")
+    compliance, _, _ = evaluate_compliance(load_patch_manifest(str(yaml_file)), parse_log_file(str(log_file)))
+    assert compliance == {"srv01": "Compliant", 1: "Compliant"}
 
 def test_load_patch_manifest(tmp_path):
     yaml_file = tmp_path / "patch.yml"